@@ -0,0 +1,106 @@
+"""Compare the speed and output size of the available JPEG and PNG encoders.
+
+Run with:
+
+    python benchmarks/encoders.py path/to/image.dcm --repeats 10
+"""
+
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Annotated
+
+import numpy as np
+import SimpleITK as sitk
+import typer
+
+import procex.functional as F
+from procex.imgio import Encoder
+from procex.imgio import encode_jpeg
+from procex.imgio import encode_png
+from procex.imgio import get_available_encoders
+from procex.imgio import read_image
+
+_app = typer.Typer(add_completion=False)
+
+
+@_app.command()
+def main(
+    input: Annotated[  # noqa: A002
+        Path | None,
+        typer.Argument(
+            help="Input image. If not given, a random 2048 x 2048 image is used.",
+        ),
+    ] = None,
+    repeats: Annotated[
+        int,
+        typer.Option(help="Number of times each image is encoded."),
+    ] = 10,
+    jpeg_quality: Annotated[
+        int,
+        typer.Option(help="Compression quality for JPEG images."),
+    ] = 95,
+    png_compression_levels: Annotated[
+        list[int] | None,
+        typer.Option(help="Compression levels for PNG images."),
+    ] = None,
+) -> None:
+    """Benchmark the available JPEG and PNG encoders."""
+    if input is None:
+        # Smooth background with some noise, loosely resembling an X-ray image
+        rng = np.random.default_rng(0)
+        y, x = np.mgrid[-1:1:2048j, -1:1:2048j]
+        array = 2000 * np.exp(-(x**2 + y**2)) + rng.normal(0, 50, size=x.shape)
+        image = sitk.GetImageFromArray(array.clip(0, 2**12 - 1).astype(np.uint16))
+    else:
+        image = read_image(input)
+    image_8 = F.enhance_contrast(image, num_bits=8)
+    image_16 = F.enhance_contrast(image, num_bits=16)
+    if png_compression_levels is None:
+        png_compression_levels = [1, 6]
+
+    print(f"{'format':<12} {'encoder':<8} {'time (ms)':>10} {'size (kB)':>10}")  # noqa: T201
+    for encoder in get_available_encoders():
+        _report(
+            "JPEG",
+            encoder,
+            lambda encoder=encoder: encode_jpeg(
+                image_8,
+                jpeg_quality,
+                encoder=encoder,
+            ),
+            repeats,
+        )
+        for level in png_compression_levels:
+            for num_bits, png_image in ((8, image_8), (16, image_16)):
+                _report(
+                    f"PNG{num_bits} ({level})",
+                    encoder,
+                    lambda encoder=encoder, level=level, png_image=png_image: (
+                        encode_png(
+                            png_image,
+                            compression_level=level,
+                            encoder=encoder,
+                        )
+                    ),
+                    repeats,
+                )
+
+
+def _report(
+    name: str,
+    encoder: Encoder,
+    encode: Callable[[], bytes],
+    repeats: int,
+) -> None:
+    data = encode()  # warm up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        encode()
+    milliseconds = 1000 * (time.perf_counter() - start) / repeats
+    kilobytes = len(data) / 1024
+    print(f"{name:<12} {encoder.value:<8} {milliseconds:>10.1f} {kilobytes:>10.1f}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    _app()
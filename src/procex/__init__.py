@@ -3,10 +3,12 @@
 import importlib.metadata
 
 from .main import process_images
+from .main import verify
 from .transforms import ToTensor
 
 __version__ = importlib.metadata.version(__name__)
 __all__ = [
     "ToTensor",
     "process_images",
+    "verify",
 ]
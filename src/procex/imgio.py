@@ -1,6 +1,12 @@
 """Input/output utilities for image processing."""
 
 import enum
+import functools
+import importlib.util
+import io
+import struct
+import tempfile
+import zlib
 from collections.abc import Callable
 from pathlib import Path
 
@@ -21,6 +27,60 @@ class ItkImageIo(str, enum.Enum):
     TIFF = "TIFFImageIO"
 
 
+@enum.unique
+class Encoder(str, enum.Enum):
+    """Library used to encode JPEG and PNG images.
+
+    `AUTO` depends on the format. JPEG images are encoded with Pillow (which
+    typically bundles libjpeg-turbo) or OpenCV if installed, as they are much
+    faster than ITK. PNG images are encoded with ITK, which is not slower than
+    the alternatives.
+    """
+
+    AUTO = "auto"
+    ITK = "itk"
+    PILLOW = "pillow"
+    OPENCV = "opencv"
+
+
+@enum.unique
+class ChromaSubsampling(str, enum.Enum):
+    """Chroma subsampling used for JPEG compression of color images."""
+
+    S444 = "4:4:4"
+    S422 = "4:2:2"
+    S420 = "4:2:0"
+
+
+_ENCODER_MODULES = {
+    Encoder.PILLOW: ("PIL", "pillow"),
+    Encoder.OPENCV: ("cv2", "opencv"),
+}
+
+_AUTO_JPEG_ENCODERS = (Encoder.PILLOW, Encoder.OPENCV, Encoder.ITK)
+_AUTO_PNG_ENCODERS = (Encoder.ITK,)
+
+# Number of components per pixel that each encoder can write, per bit depth
+_SUPPORTED_COMPONENTS = {
+    "JPEG": {
+        Encoder.ITK: {8: (1, 3)},
+        Encoder.PILLOW: {8: (1, 3)},
+        Encoder.OPENCV: {8: (1, 3)},
+    },
+    "PNG": {
+        Encoder.ITK: {8: (1, 3, 4), 16: (1, 3, 4)},
+        Encoder.PILLOW: {8: (1, 2, 3, 4), 16: (1,)},
+        Encoder.OPENCV: {8: (1, 3, 4), 16: (1, 3, 4)},
+    },
+}
+
+_OPENCV_SUBSAMPLING_FACTORS = {
+    ChromaSubsampling.S444: 0x111111,
+    ChromaSubsampling.S422: 0x211111,
+    ChromaSubsampling.S420: 0x221111,
+}
+
+
 def read_image(
     path: TypePath,
     *,
@@ -69,43 +129,348 @@ def write_tiff(
 
 
 def check_uint8(func: Callable) -> Callable:
+    @functools.wraps(func)
     def wrapper(
         image: sitk.Image,
         path: TypePath,
         *args,
         **kwargs,
     ) -> None:
-        if image.GetPixelID() != sitk.sitkUInt8:
-            msg = (
-                f'Expected image "{path}" to have pixel type "8-bit unsigned integer",'
-                f' but got "{image.GetPixelIDTypeAsString()}"'
-            )
-            raise ValueError(msg)
+        _check_uint8(image, f'image "{path}"')
         return func(image, path, *args, **kwargs)
 
     return wrapper
 
 
-@check_uint8
-def write_jpeg(
+def write_jpeg(  # noqa: PLR0913
     image: sitk.Image,
     path: TypePath,
     quality: int = 95,  # default in ITK: https://github.com/InsightSoftwareConsortium/ITK/blob/15af3aed65693811448c9af22ce9d09ff9f3000a/Modules/IO/JPEG/src/itkJPEGImageIO.cxx#L300
+    *,
+    subsampling: ChromaSubsampling | None = None,
+    optimize: bool = False,
+    encoder: Encoder = Encoder.AUTO,
 ) -> None:
+    """Write an 8-bit image to a JPEG file.
+
+    Args:
+        image: The input image.
+        path: The path to the output file.
+        quality: Compression quality, between 0 and 100.
+        subsampling: Chroma subsampling for color images. If `None`, the default
+            of the encoder is used. Not supported by ITK.
+        optimize: Whether to compute optimal Huffman tables, which produces
+            smaller files at a small encoding cost. Not supported by ITK.
+        encoder: Library used to encode the image.
+    """
     _check_suffix(path, (".jpg", ".jpeg"))
-    writer = sitk.ImageFileWriter()
-    writer.SetImageIO(ItkImageIo.JPEG.value)
-    writer.SetCompressionLevel(quality)
-    writer.SetFileName(str(path))
-    writer.Execute(image)
+    _check_uint8(image, f'image "{path}"')
+    encoder = get_encoder(encoder, path)
+    _check_encoder_support(image, encoder, "JPEG")
+    if encoder == Encoder.ITK:
+        _check_itk_jpeg_options(subsampling=subsampling, optimize=optimize)
+        _write_itk(image, path, ItkImageIo.JPEG, quality)
+        return
+    data = encode_jpeg(
+        image,
+        quality,
+        subsampling=subsampling,
+        optimize=optimize,
+        encoder=encoder,
+    )
+    Path(path).write_bytes(data)
 
 
 def write_png(
     image: sitk.Image,
     path: TypePath,
+    *,
+    compression_level: int = 6,
+    encoder: Encoder = Encoder.AUTO,
 ) -> None:
+    """Write an 8- or 16-bit image to a PNG file.
+
+    Args:
+        image: The input image.
+        path: The path to the output file.
+        compression_level: zlib compression level, between 0 and 9. Lower values
+            are faster to encode but produce larger files.
+        encoder: Library used to encode the image.
+    """
     _check_suffix(path, ".png")
-    write_image(image, path)
+    _check_uint8_or_uint16(image, f'image "{path}"')
+    encoder = get_encoder(encoder, path)
+    _check_encoder_support(image, encoder, "PNG")
+    if encoder == Encoder.ITK:
+        _write_itk(image, path, ItkImageIo.PNG, compression_level)
+        return
+    data = encode_png(image, compression_level=compression_level, encoder=encoder)
+    Path(path).write_bytes(data)
+
+
+def encode_jpeg(
+    image: sitk.Image,
+    quality: int = 95,
+    *,
+    subsampling: ChromaSubsampling | None = None,
+    optimize: bool = False,
+    encoder: Encoder = Encoder.AUTO,
+) -> bytes:
+    """Encode an 8-bit image as JPEG into an in-memory buffer.
+
+    Args:
+        image: The input image.
+        quality: Compression quality, between 0 and 100.
+        subsampling: Chroma subsampling for color images. If `None`, the default
+            of the encoder is used. Not supported by ITK.
+        optimize: Whether to compute optimal Huffman tables. Not supported by
+            ITK.
+        encoder: Library used to encode the image.
+
+    Returns:
+        The encoded JPEG file contents.
+    """
+    _check_uint8(image, "image")
+    check_quality(quality)
+    encoder = _resolve_encoder(encoder, _AUTO_JPEG_ENCODERS)
+    _check_encoder_support(image, encoder, "JPEG")
+    match encoder:
+        case Encoder.PILLOW:
+            kwargs = {"quality": quality, "optimize": optimize}
+            if subsampling is not None:
+                kwargs["subsampling"] = ChromaSubsampling(subsampling).value
+            return _encode_pillow(image, "JPEG", **kwargs)
+        case Encoder.OPENCV:
+            import cv2
+
+            params = [
+                cv2.IMWRITE_JPEG_QUALITY,
+                quality,
+                cv2.IMWRITE_JPEG_OPTIMIZE,
+                int(optimize),
+            ]
+            if subsampling is not None:
+                factor = _OPENCV_SUBSAMPLING_FACTORS[ChromaSubsampling(subsampling)]
+                params += [cv2.IMWRITE_JPEG_SAMPLING_FACTOR, factor]
+            return _encode_opencv(image, ".jpg", params)
+        case _:
+            _check_itk_jpeg_options(subsampling=subsampling, optimize=optimize)
+            return _encode_itk(image, ".jpg", ItkImageIo.JPEG, quality)
+
+
+def encode_png(
+    image: sitk.Image,
+    *,
+    compression_level: int = 6,
+    encoder: Encoder = Encoder.AUTO,
+) -> bytes:
+    """Encode an 8- or 16-bit image as PNG into an in-memory buffer.
+
+    Args:
+        image: The input image.
+        compression_level: zlib compression level, between 0 and 9.
+        encoder: Library used to encode the image.
+
+    Returns:
+        The encoded PNG file contents.
+    """
+    _check_uint8_or_uint16(image, "image")
+    check_compression_level(compression_level)
+    encoder = _resolve_encoder(encoder, _AUTO_PNG_ENCODERS)
+    _check_encoder_support(image, encoder, "PNG")
+    match encoder:
+        case Encoder.PILLOW:
+            data = _encode_pillow(image, "PNG", compress_level=compression_level)
+        case Encoder.OPENCV:
+            import cv2
+
+            params = [cv2.IMWRITE_PNG_COMPRESSION, compression_level]
+            data = _encode_opencv(image, ".png", params)
+        case _:
+            return _encode_itk(image, ".png", ItkImageIo.PNG, compression_level)
+    return _add_png_spacing(data, image.GetSpacing())
+
+
+def get_available_encoders() -> list[Encoder]:
+    """Return the encoders that can be used in the current environment."""
+    encoders = [
+        encoder
+        for encoder, (module, _) in _ENCODER_MODULES.items()
+        if importlib.util.find_spec(module) is not None
+    ]
+    encoders.append(Encoder.ITK)
+    return encoders
+
+
+def get_encoder(encoder: Encoder, path: TypePath) -> Encoder:
+    """Return the encoder used to write an image to a file.
+
+    Args:
+        encoder: The requested encoder.
+        path: The path to the output file.
+
+    Returns:
+        The encoder that is used for the file format, which is never `AUTO`.
+    """
+    match Path(path).suffix:
+        case ".jpg" | ".jpeg":
+            return _resolve_encoder(encoder, _AUTO_JPEG_ENCODERS)
+        case ".png":
+            return _resolve_encoder(encoder, _AUTO_PNG_ENCODERS)
+        case _:
+            return Encoder.ITK
+
+
+def _resolve_encoder(
+    encoder: Encoder,
+    auto_encoders: tuple[Encoder, ...],
+) -> Encoder:
+    encoder = Encoder(encoder)
+    available_encoders = get_available_encoders()
+    if encoder == Encoder.AUTO:
+        return next(e for e in auto_encoders if e in available_encoders)
+    if encoder not in available_encoders:
+        _, extra = _ENCODER_MODULES[encoder]
+        message = (
+            f'The "{encoder.value}" encoder requires extra packages to be installed.'
+            f" Install with `pip install procex[{extra}]`."
+        )
+        raise ImportError(message)
+    return encoder
+
+
+def _check_encoder_support(
+    image: sitk.Image,
+    encoder: Encoder,
+    image_format: str,
+) -> None:
+    num_bits = 8 * image.GetSizeOfPixelComponent()
+    num_components = image.GetNumberOfComponentsPerPixel()
+    supported = _SUPPORTED_COMPONENTS[image_format][encoder].get(num_bits, ())
+    if num_components not in supported:
+        message = (
+            f'The "{encoder.value}" encoder cannot write {num_bits}-bit'
+            f" {image_format} images with {num_components} components per pixel."
+            f" Supported numbers of components: {supported}"
+        )
+        raise ValueError(message)
+
+
+def _check_itk_jpeg_options(
+    *,
+    subsampling: ChromaSubsampling | None,
+    optimize: bool,
+) -> None:
+    if subsampling is not None or optimize:
+        message = (
+            "ITK does not support setting the JPEG subsampling or optimization."
+            " Use a different encoder."
+        )
+        raise ValueError(message)
+
+
+def _check_uint8(image: sitk.Image, description: str) -> None:
+    pixel_ids = (sitk.sitkUInt8, sitk.sitkVectorUInt8)
+    _check_pixel_type(image, description, pixel_ids, "8-bit unsigned integer")
+
+
+def _check_uint8_or_uint16(image: sitk.Image, description: str) -> None:
+    pixel_ids = (
+        sitk.sitkUInt8,
+        sitk.sitkVectorUInt8,
+        sitk.sitkUInt16,
+        sitk.sitkVectorUInt16,
+    )
+    expected = "8- or 16-bit unsigned integer"
+    _check_pixel_type(image, description, pixel_ids, expected)
+
+
+def _check_pixel_type(
+    image: sitk.Image,
+    description: str,
+    pixel_ids: tuple[int, ...],
+    expected: str,
+) -> None:
+    if image.GetPixelID() not in pixel_ids:
+        msg = (
+            f'Expected {description} to have pixel type "{expected}",'
+            f' but got "{image.GetPixelIDTypeAsString()}"'
+        )
+        raise ValueError(msg)
+
+
+def _write_itk(
+    image: sitk.Image,
+    path: TypePath,
+    image_io: ItkImageIo,
+    compression_level: int,
+) -> None:
+    writer = sitk.ImageFileWriter()
+    writer.SetImageIO(image_io.value)
+    writer.UseCompressionOn()
+    writer.SetCompressionLevel(compression_level)
+    writer.SetFileName(str(path))
+    writer.Execute(image)
+
+
+def _encode_itk(
+    image: sitk.Image,
+    suffix: str,
+    image_io: ItkImageIo,
+    compression_level: int,
+) -> bytes:
+    # ITK can only write to files, so we go through a temporary one
+    with tempfile.TemporaryDirectory() as tempdir:
+        path = Path(tempdir) / f"image{suffix}"
+        _write_itk(image, path, image_io, compression_level)
+        return path.read_bytes()
+
+
+def _encode_pillow(image: sitk.Image, format: str, **kwargs) -> bytes:  # noqa: A002
+    from PIL import Image
+
+    array = sitk.GetArrayViewFromImage(image)
+    buffer = io.BytesIO()
+    Image.fromarray(array).save(buffer, format=format, **kwargs)
+    return buffer.getvalue()
+
+
+def _encode_opencv(image: sitk.Image, suffix: str, params: list[int]) -> bytes:
+    import cv2
+
+    array = sitk.GetArrayViewFromImage(image)
+    # OpenCV expects color channels in BGR order
+    match image.GetNumberOfComponentsPerPixel():
+        case 1:
+            pass
+        case 3:
+            array = cv2.cvtColor(array, cv2.COLOR_RGB2BGR)
+        case 4:
+            array = cv2.cvtColor(array, cv2.COLOR_RGBA2BGRA)
+        case num_components:
+            message = f"OpenCV cannot encode images with {num_components} components"
+            raise ValueError(message)
+    success, encoded = cv2.imencode(suffix, array, params)
+    if not success:
+        message = f'OpenCV could not encode the image as "{suffix}"'
+        raise RuntimeError(message)
+    return encoded.tobytes()
+
+
+def _add_png_spacing(data: bytes, spacing: tuple[float, ...]) -> bytes:
+    """Insert the pixel spacing into an encoded PNG file, as ITK does.
+
+    The spacing is stored in a sCAL chunk right after the IHDR chunk. Pillow and
+    OpenCV cannot write this chunk themselves.
+    """
+    width, height = spacing[:2]
+    chunk_type = b"sCAL"
+    payload = f"\x01{width!r}\x00{height!r}".encode("ascii")
+    crc = zlib.crc32(chunk_type + payload)
+    chunk = struct.pack(">I", len(payload)) + chunk_type + payload
+    chunk += struct.pack(">I", crc)
+    header_end = 8 + 25  # PNG signature and IHDR chunk
+    return data[:header_end] + chunk + data[header_end:]
 
 
 def _check_suffix(path: TypePath, suffixes: str | tuple[str, ...]) -> None:
@@ -125,3 +490,15 @@ def check_quality(value: int) -> int:
         message = f"Quality must be an integer between 0 and 100 but got {value}."
         raise ValueError(message)
     return value
+
+
+def check_compression_level(value: int) -> int:
+    """Check that a value is a valid compression level for PNG compression."""
+    min_level = 0
+    max_level = 9
+    if not (min_level <= value <= max_level):
+        message = (
+            f"Compression level must be an integer between 0 and 9 but got {value}."
+        )
+        raise ValueError(message)
+    return value
@@ -1,26 +1,61 @@
 """Main entry point for the procex command-line interface."""
 
 import os
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from enum import Enum
 from functools import partial
 from pathlib import Path
 from typing import Annotated
+from typing import Any
 
 import typer
 from tqdm.auto import tqdm
-from tqdm.contrib.concurrent import process_map
+from tqdm.contrib.concurrent import thread_map
+from typer.core import TyperGroup
 
 import procex.functional as F
+from procex.imgio import Encoder
+from procex.imgio import check_compression_level
 from procex.imgio import check_quality
+from procex.imgio import get_encoder
 from procex.imgio import read_image
 from procex.imgio import write_image
 from procex.imgio import write_jpeg
+from procex.imgio import write_png
+from procex.manifest import describe_output
+from procex.manifest import read_manifest
+from procex.manifest import verify_entry
+from procex.manifest import write_manifest
+
+
+class _DefaultCommandGroup(TyperGroup):
+    """Group that runs `process-images` if the first argument is not a command.
+
+    This keeps `procex INPUT OUTPUT` working as a shortcut for
+    `procex process-images INPUT OUTPUT`.
+    """
+
+    default_command = "process-images"
+
+    def parse_args(self, ctx: typer.Context, args: list[str]) -> list[str]:
+        if args and args[0] not in [*self.commands, *ctx.help_option_names]:
+            args = [self.default_command, *args]
+        return super().parse_args(ctx, args)
+
 
 disable_rich = os.environ.get("PROCEX_DISABLE_RICH", "0") == "1"
 rich_kwargs = {}
 if disable_rich:
     rich_kwargs["rich_markup_mode"] = None
 _app = typer.Typer(
+    cls=_DefaultCommandGroup,
+    help=(
+        "Preprocess medical images. If no command is given, process-images is run,"
+        " so `procex INPUT OUTPUT` is equivalent to"
+        " `procex process-images INPUT OUTPUT`."
+    ),
     no_args_is_help=True,
     add_completion=False,
     **rich_kwargs,
@@ -80,6 +115,27 @@ def process_images(  # noqa: PLR0913
             callback=check_quality,
         ),
     ] = 95,
+    png_compression_level: Annotated[
+        int,
+        typer.Option(
+            ...,
+            help=(
+                "Compression level for output PNG images, between 0 and 9. Lower values"
+                " are faster but produce larger files."
+            ),
+            callback=check_compression_level,
+        ),
+    ] = 6,
+    encoder: Annotated[
+        Encoder,
+        typer.Option(
+            ...,
+            help=(
+                "Library used to encode output JPEG and PNG images. If auto, use"
+                " Pillow or OpenCV for JPEG if installed, and ITK for PNG."
+            ),
+        ),
+    ] = Encoder.AUTO,
     percentiles: Annotated[
         tuple[float, float],
         typer.Option(
@@ -101,6 +157,16 @@ def process_images(  # noqa: PLR0913
             help="Output image format. Only used when output is a directory.",
         ),
     ] = None,
+    manifest: Annotated[
+        Path | None,
+        typer.Option(
+            ...,
+            help=(
+                "Path to a JSON Lines file where a description of each output image"
+                " is written, so outputs can be checked later with `procex verify`."
+            ),
+        ),
+    ] = None,
     *,
     histeq: Annotated[
         bool,
@@ -131,27 +197,96 @@ def process_images(  # noqa: PLR0913
     input_paths = _get_input_paths(input)
     output_paths = _get_output_paths(output, input_paths, format=format)
 
-    _process = partial(
-        _process_image,
-        size=size,
-        num_bits=num_bits,
-        jpeg_quality=jpeg_quality,
-        percentiles=percentiles,
-        values=values,
-        histeq=histeq,
-        mimic=mimic,
-    )
+    options = {
+        "size": size,
+        "num_bits": num_bits,
+        "jpeg_quality": jpeg_quality,
+        "png_compression_level": png_compression_level,
+        "encoder": encoder,
+        "percentiles": percentiles,
+        "values": values,
+        "histeq": histeq,
+        "mimic": mimic,
+    }
+    _process = partial(_process_image, **options)
+    if manifest is not None:
+        _process = partial(
+            _process_and_describe,
+            process=_process,
+            options=options,
+            root=manifest.parent,
+        )
+
+    with ProcessPoolExecutor() if parallel else nullcontext() as executor:
+        map_function = executor.map if executor is not None else map
+        results = map_function(_process, input_paths, output_paths)
+        if parallel or len(input_paths) > 1:
+            results = tqdm(results, total=len(input_paths))
+        if manifest is None:
+            for _ in results:
+                pass
+        else:
+            # Entries are written as images are processed, so that the manifest
+            # describes the completed outputs even if processing fails
+            write_manifest(results, manifest)
 
-    if parallel:
-        process_map(_process, input_paths, output_paths, chunksize=1)
-        return
 
-    if len(input_paths) > 1:
-        progress = tqdm(list(zip(input_paths, output_paths, strict=True)))
-        for input_path, output_path in progress:
-            _process(input_path, output_path)
+@_app.command()
+def verify(
+    manifest: Annotated[
+        Path,
+        typer.Argument(
+            ...,
+            help="Path to a manifest written by `procex process-images --manifest`.",
+        ),
+    ],
+    *,
+    check_inputs: Annotated[
+        bool,
+        typer.Option(
+            ...,
+            help="Whether to also check that the input images have not changed.",
+        ),
+    ] = False,
+    parallel: Annotated[
+        bool,
+        typer.Option(
+            ...,
+            help="Whether to check images in parallel.",
+        ),
+    ] = False,
+) -> None:
+    """Check processed images against a manifest without processing them again.
+
+    Each output image is checked for existence, file size, header size and pixel
+    type and SHA-256 hash. Pixel data is not decoded.
+    """
+    entries = read_manifest(manifest)
+    _verify = partial(verify_entry, root=manifest.parent, check_input=check_inputs)
+    if parallel:
+        results = thread_map(_verify, entries)
     else:
-        _process(input_paths[0], output_paths[0])
+        results = [_verify(entry) for entry in tqdm(entries)]
+
+    problems = [problem for result in results for problem in result]
+    for problem in problems:
+        typer.echo(problem, err=True)
+    if problems:
+        raise typer.Exit(code=1)
+
+
+def _process_and_describe(
+    input_path: Path,
+    output_path: Path,
+    process: Callable[[Path, Path], Path],
+    options: dict[str, Any],
+    root: Path,
+) -> dict[str, Any]:
+    output_path = process(input_path, output_path)
+    # Record the encoder that was actually used rather than "auto"
+    encoder = get_encoder(options["encoder"], output_path)
+    options = {**options, "encoder": encoder}
+    return describe_output(input_path, output_path, options, root=root)
 
 
 def _process_image(  # noqa: PLR0913
@@ -160,20 +295,22 @@ def _process_image(  # noqa: PLR0913
     size: int | None,
     num_bits: NumBits,
     jpeg_quality: int,
+    png_compression_level: int,
+    encoder: Encoder,
     percentiles: tuple[float, float],
     values: tuple[float, float] | None,
     *,
     histeq: bool,
     mimic: bool,
-) -> None:
+) -> Path:
     image = read_image(input_path)
 
     if mimic:
         image = F.enhance_contrast(image, num_bits=8, histeq=True)
         if output_path.suffix not in {".jpg", ".jpeg"}:
             output_path = output_path.with_suffix(".jpg")
-        write_jpeg(image, output_path, quality=95)
-        return
+        write_jpeg(image, output_path, quality=95, encoder=encoder)
+        return output_path
 
     if size is not None:
         image = F.resize(image, size)
@@ -188,9 +325,17 @@ def _process_image(  # noqa: PLR0913
 
     match output_path.suffix:
         case ".jpg" | ".jpeg":
-            write_jpeg(image, output_path, jpeg_quality)
+            write_jpeg(image, output_path, jpeg_quality, encoder=encoder)
+        case ".png":
+            write_png(
+                image,
+                output_path,
+                compression_level=png_compression_level,
+                encoder=encoder,
+            )
         case _:
             write_image(image, output_path)
+    return output_path
 
 
 def _get_input_paths(input_path: Path) -> list[Path]:
@@ -0,0 +1,177 @@
+"""Manifests to verify processed images without processing them again."""
+
+import hashlib
+import json
+import os
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import SimpleITK as sitk
+
+from .type_definitions import TypePath
+
+_CHUNK_SIZE = 2**20
+
+
+def hash_file(path: TypePath) -> str:
+    """Compute the SHA-256 hash of a file.
+
+    Args:
+        path: The path to the file.
+
+    Returns:
+        The hexadecimal digest of the file contents.
+    """
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as file:
+        while chunk := file.read(_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_header(path: TypePath) -> dict[str, Any]:
+    """Read the size and pixel type of an image without reading its pixels.
+
+    Args:
+        path: The path to the image file.
+
+    Returns:
+        A dictionary with the image size and pixel type.
+    """
+    reader = sitk.ImageFileReader()
+    reader.SetFileName(str(path))
+    reader.ReadImageInformation()
+    return {
+        "size": list(reader.GetSize()),
+        "pixel_type": sitk.GetPixelIDValueAsString(reader.GetPixelID()),
+        "num_components": reader.GetNumberOfComponents(),
+    }
+
+
+def describe_output(
+    input_path: TypePath,
+    output_path: TypePath,
+    options: dict[str, Any],
+    *,
+    root: TypePath,
+) -> dict[str, Any]:
+    """Create a manifest entry for a processed image.
+
+    Args:
+        input_path: The path to the input image.
+        output_path: The path to the output image.
+        options: The options used to process the image.
+        root: Directory the paths are stored relative to, typically the one
+            containing the manifest, so that it can be moved with the images.
+
+    Returns:
+        A JSON-serializable dictionary describing the output image.
+    """
+    return {
+        "output": {
+            "path": _relative_path(output_path, root),
+            "num_bytes": Path(output_path).stat().st_size,
+            "sha256": hash_file(output_path),
+            **read_header(output_path),
+        },
+        "input": {
+            "path": _relative_path(input_path, root),
+            "num_bytes": Path(input_path).stat().st_size,
+            "sha256": hash_file(input_path),
+        },
+        "options": options,
+    }
+
+
+def write_manifest(entries: Iterable[dict[str, Any]], path: TypePath) -> None:
+    """Write manifest entries to a JSON Lines file.
+
+    Each entry is written as soon as it is available, so the manifest is not
+    lost if an error occurs while the entries are being computed.
+
+    Args:
+        entries: Entries created with `describe_output`.
+        path: The path to the output manifest.
+    """
+    with Path(path).open("w") as file:
+        for entry in entries:
+            file.write(json.dumps(entry) + "\n")
+            file.flush()
+
+
+def read_manifest(path: TypePath) -> list[dict[str, Any]]:
+    """Read manifest entries from a JSON Lines file.
+
+    Args:
+        path: The path to the manifest.
+
+    Returns:
+        The manifest entries.
+    """
+    lines = Path(path).read_text().strip().splitlines()
+    return [json.loads(line) for line in lines]
+
+
+def verify_entry(
+    entry: dict[str, Any],
+    *,
+    root: TypePath,
+    check_input: bool = False,
+) -> list[str]:
+    """Check that an output image matches its manifest entry.
+
+    Cheap checks (existence, file size and header) run first, and the file is
+    only hashed if they pass. Pixel data is never decoded.
+
+    Args:
+        entry: An entry created with `describe_output`.
+        root: Directory the paths in the entry are relative to.
+        check_input: Whether to also check that the input image has not changed
+            since it was processed.
+
+    Returns:
+        A list of problems found. The list is empty if the output is valid.
+    """
+    problems = _verify_output(entry["output"], root)
+    if check_input:
+        problems.extend(_verify_input(entry["input"], root))
+    return problems
+
+
+def _relative_path(path: TypePath, root: TypePath) -> str:
+    relative = os.path.relpath(Path(path).resolve(), Path(root).resolve())
+    return Path(relative).as_posix()
+
+
+def _verify_input(expected: dict[str, Any], root: TypePath) -> list[str]:
+    path = Path(root) / expected["path"]
+    if not path.is_file():
+        return [f"{path}: input file not found"]
+    # The file is only hashed if its size has not changed
+    changed = (
+        path.stat().st_size != expected["num_bytes"]
+        or hash_file(path) != expected["sha256"]
+    )
+    return [f"{path}: input has changed since processing"] if changed else []
+
+
+def _verify_output(expected: dict[str, Any], root: TypePath) -> list[str]:
+    path = Path(root) / expected["path"]
+    if not path.is_file():
+        return [f"{path}: file not found"]
+    num_bytes = path.stat().st_size
+    if num_bytes != expected["num_bytes"]:
+        return [f"{path}: expected {expected['num_bytes']} bytes, found {num_bytes}"]
+    try:
+        header = read_header(path)
+    except RuntimeError:
+        return [f"{path}: header could not be read"]
+    problems = [
+        f'{path}: expected {key} "{expected[key]}", found "{value}"'
+        for key, value in header.items()
+        if value != expected[key]
+    ]
+    if not problems and hash_file(path) != expected["sha256"]:
+        problems.append(f"{path}: hash mismatch")
+    return problems
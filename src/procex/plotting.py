@@ -1,13 +1,35 @@
 """Functions to plot images and histograms."""
 
+from collections.abc import Sequence
+
 import matplotlib.pyplot as plt
+import numpy as np
 import SimpleITK as sitk
 from matplotlib.axes import Axes
 
+from .imgio import read_image
+from .type_definitions import TypePath
+
 
-def plot_image(image: sitk.Image, ax: Axes | None = None) -> None:
+def plot_image(
+    image: sitk.Image,
+    ax: Axes | None = None,
+    *,
+    max_size: int | None = 1024,
+) -> None:
+    """Plot an image in grayscale.
+
+    Args:
+        image: The input image.
+        ax: The axes to plot on. If `None`, a new figure is created.
+        max_size: Maximum size of the largest side of the plotted image. Larger
+            images are downsampled by averaging blocks of pixels. If `None`, the
+            image is plotted at full resolution.
+    """
     if ax is None:
         _, ax = plt.subplots()
+    if max_size is not None:
+        image = get_preview(image, max_size)
     array = sitk.GetArrayViewFromImage(image)
     ax.imshow(array, cmap="gray")
 
@@ -16,11 +38,146 @@ def plot_histogram(
     image: sitk.Image,
     ax: Axes | None = None,
     *,
+    bins: int = 256,
     log: bool = True,
 ) -> None:
+    """Plot the intensity histogram of an image.
+
+    Args:
+        image: The input image.
+        ax: The axes to plot on. If `None`, a new figure is created.
+        bins: Maximum number of bins of the histogram.
+        log: Whether to use a logarithmic scale for the counts.
+    """
     if ax is None:
         _, ax = plt.subplots()
-    array = sitk.GetArrayViewFromImage(image)
-    ax.hist(array.ravel(), bins=256)
+    counts, edges = compute_histogram(image, bins=bins)
+    ax.stairs(counts, edges, fill=True)
     if log:
         ax.set_yscale("log")
+
+
+def plot_contact_sheet(
+    input_paths: Sequence[TypePath],
+    output_paths: Sequence[TypePath],
+    ax: Axes | None = None,
+    *,
+    num_columns: int = 8,
+    thumbnail_size: int = 128,
+) -> None:
+    """Plot thumbnails of input and output images side by side in a grid.
+
+    Images are read and downsampled one at a time, so only the thumbnails are
+    kept in memory.
+
+    Args:
+        input_paths: Paths to the input images, e.g., the ones passed to
+            [`process_images`][procex.main.process_images].
+        output_paths: Paths to the corresponding output images.
+        ax: The axes to plot on. If `None`, a new figure is created.
+        num_columns: Number of input/output pairs per row.
+        thumbnail_size: Size of the largest side of each thumbnail.
+
+    Raises:
+        ValueError: If no paths are given or the number of input and output
+            paths is different.
+    """
+    if not input_paths:
+        message = "At least one pair of input and output images must be given"
+        raise ValueError(message)
+    if len(input_paths) != len(output_paths):
+        message = (
+            f"Number of input images ({len(input_paths)}) does not match the number"
+            f" of output images ({len(output_paths)})"
+        )
+        raise ValueError(message)
+    num_columns = min(num_columns, len(input_paths))
+    num_rows = -(-len(input_paths) // num_columns)
+    sheet = np.zeros(
+        (num_rows * thumbnail_size, 2 * num_columns * thumbnail_size),
+        dtype=np.uint8,
+    )
+    pairs = zip(input_paths, output_paths, strict=True)
+    for index, pair in enumerate(pairs):
+        row, column = divmod(index, num_columns)
+        for offset, path in enumerate(pair):
+            preview = get_preview(read_image(path), thumbnail_size)
+            thumbnail = _to_uint8(sitk.GetArrayViewFromImage(preview))
+            height, width = thumbnail.shape
+            top = row * thumbnail_size + (thumbnail_size - height) // 2
+            left = (2 * column + offset) * thumbnail_size
+            left += (thumbnail_size - width) // 2
+            sheet[top : top + height, left : left + width] = thumbnail
+
+    if ax is None:
+        _, ax = plt.subplots(figsize=(2 * num_columns, num_rows))
+    ax.imshow(sheet, cmap="gray", vmin=0, vmax=255, interpolation="nearest")
+    ax.set_axis_off()
+
+
+def compute_histogram(
+    image: sitk.Image,
+    *,
+    bins: int = 256,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Compute the intensity histogram of an image.
+
+    For integer images with a moderate intensity range, the number of
+    occurrences of each intensity value is counted with `np.bincount` and
+    neighboring values are then grouped into at most `bins` bins of equal width.
+    Otherwise, `np.histogram` is used.
+
+    Args:
+        image: The input image.
+        bins: Maximum number of bins of the histogram.
+
+    Returns:
+        The counts and the edges of the bins, which has one more element.
+    """
+    array = sitk.GetArrayViewFromImage(image).ravel()
+    if not np.issubdtype(array.dtype, np.integer):
+        return np.histogram(array, bins=bins)
+    minimum, maximum = int(array.min()), int(array.max())
+    # Counting every value in a wide range would need too much memory
+    if maximum - minimum >= max(2**16, array.size):
+        return np.histogram(array, bins=bins)
+    if np.issubdtype(array.dtype, np.unsignedinteger):
+        shifted = array - array.dtype.type(minimum)
+    else:
+        shifted = array.astype(np.int64) - minimum
+    counts = np.bincount(shifted.astype(np.intp, copy=False))
+    bin_width = -(-len(counts) // bins)
+    padding = -len(counts) % bin_width
+    counts = np.pad(counts, (0, padding)).reshape(-1, bin_width).sum(axis=1)
+    edges = float(minimum) + bin_width * np.arange(len(counts) + 1)
+    return counts, edges
+
+
+def get_preview(image: sitk.Image, max_size: int) -> sitk.Image:
+    """Downsample an image so that its largest side is at most `max_size`.
+
+    Pixels are averaged within blocks of an integer size, which is fast and
+    does not require computing an intermediate image at full resolution.
+
+    Args:
+        image: The input image.
+        max_size: Maximum size of the largest side of the output image.
+
+    Returns:
+        The downsampled image, or the input image if it is already small enough.
+    """
+    size = image.GetSize()
+    factor = -(-max(size) // max_size)
+    if factor <= 1:
+        return image
+    # The shrink factor cannot be larger than the size along each dimension
+    factors = [min(factor, dim_size) for dim_size in size]
+    return sitk.BinShrink(image, factors)
+
+
+def _to_uint8(array: np.ndarray) -> np.ndarray:
+    minimum, maximum = array.min(), array.max()
+    if maximum == minimum:
+        return np.zeros(array.shape, dtype=np.uint8)
+    scaled = (array.astype(np.float32) - minimum) * (255 / (maximum - minimum))
+    return scaled.round().astype(np.uint8)
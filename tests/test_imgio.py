@@ -0,0 +1,80 @@
+"""Tests for the JPEG and PNG encoders."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+import SimpleITK as sitk
+
+from procex.imgio import Encoder
+from procex.imgio import get_available_encoders
+from procex.imgio import write_jpeg
+from procex.imgio import write_png
+
+ENCODERS = [Encoder.ITK, Encoder.PILLOW, Encoder.OPENCV]
+
+# Name, dtype and number of components per pixel
+IMAGES = {
+    "uint8": (np.uint8, 1),
+    "uint16": (np.uint16, 1),
+    "rgb8": (np.uint8, 3),
+    "rgb16": (np.uint16, 3),
+    "rgba8": (np.uint8, 4),
+}
+
+UNSUPPORTED_PNG = {(Encoder.PILLOW, "rgb16")}
+SUPPORTED_JPEG = {"uint8", "rgb8"}
+
+
+def _make_image(name: str) -> sitk.Image:
+    dtype, num_components = IMAGES[name]
+    shape = (20, 30) if num_components == 1 else (20, 30, num_components)
+    rng = np.random.default_rng(0)
+    array = rng.integers(0, np.iinfo(dtype).max, shape, endpoint=True, dtype=dtype)
+    image = sitk.GetImageFromArray(array, isVector=num_components > 1)
+    image.SetSpacing((0.2, 0.3))
+    return image
+
+
+@pytest.fixture(params=ENCODERS, ids=lambda encoder: encoder.value)
+def encoder(request: pytest.FixtureRequest) -> Encoder:
+    if request.param not in get_available_encoders():
+        pytest.skip(f"{request.param.value} is not installed")
+    return request.param
+
+
+@pytest.mark.parametrize("name", IMAGES)
+def test_png_round_trip(encoder: Encoder, name: str, tmp_path: Path) -> None:
+    image = _make_image(name)
+    path = tmp_path / "image.png"
+    if (encoder, name) in UNSUPPORTED_PNG:
+        with pytest.raises(ValueError, match=encoder.value):
+            write_png(image, path, encoder=encoder)
+        return
+    write_png(image, path, encoder=encoder)
+    read = sitk.ReadImage(str(path))
+    assert read.GetPixelID() == image.GetPixelID()
+    assert read.GetSpacing() == pytest.approx(image.GetSpacing())
+    np.testing.assert_array_equal(
+        sitk.GetArrayViewFromImage(read),
+        sitk.GetArrayViewFromImage(image),
+    )
+
+
+@pytest.mark.parametrize("name", IMAGES)
+def test_jpeg_round_trip(encoder: Encoder, name: str, tmp_path: Path) -> None:
+    image = _make_image(name)
+    path = tmp_path / "image.jpg"
+    if name not in SUPPORTED_JPEG:
+        with pytest.raises(ValueError, match=r"8-bit|components"):
+            write_jpeg(image, path, encoder=encoder)
+        return
+    write_jpeg(image, path, encoder=encoder)
+    read = sitk.ReadImage(str(path))
+    assert read.GetSize() == image.GetSize()
+    assert read.GetPixelID() == image.GetPixelID()
+
+
+def test_write_jpeg_metadata() -> None:
+    assert write_jpeg.__name__ == "write_jpeg"
+    assert write_jpeg.__doc__ is not None
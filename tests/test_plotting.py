@@ -0,0 +1,34 @@
+"""Tests for the plotting helpers."""
+
+import numpy as np
+import pytest
+import SimpleITK as sitk
+
+pytest.importorskip("matplotlib")
+
+from procex.plotting import compute_histogram
+from procex.plotting import get_preview
+
+
+@pytest.mark.parametrize("dtype", [np.uint8, np.uint16, np.int16, np.int32])
+def test_histogram_matches_numpy(dtype: type) -> None:
+    rng = np.random.default_rng(0)
+    array = rng.integers(-1000 if dtype in (np.int16, np.int32) else 0, 250, (50, 60))
+    array = array.astype(dtype)
+    counts, edges = compute_histogram(sitk.GetImageFromArray(array))
+    assert len(counts) <= 256
+    expected, _ = np.histogram(array, bins=edges)
+    np.testing.assert_array_equal(counts, expected)
+
+
+@pytest.mark.parametrize("dtype", [np.uint32, np.int64, np.uint64])
+def test_histogram_wide_range(dtype: type) -> None:
+    array = np.array([[0, 1], [2, 3_000_000_000]], dtype=dtype)
+    counts, _ = compute_histogram(sitk.GetImageFromArray(array))
+    assert counts.sum() == array.size
+
+
+@pytest.mark.parametrize("shape", [(3, 10000), (10000, 3), (500, 400)])
+def test_preview_size(shape: tuple[int, int]) -> None:
+    image = sitk.GetImageFromArray(np.zeros(shape, dtype=np.uint8))
+    assert max(get_preview(image, 128).GetSize()) <= 128